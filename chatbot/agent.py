@@ -1,19 +1,20 @@
 import os
-from langchain.agents import AgentExecutor, create_tool_calling_agent
-from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
-from chatbot.memory import agent_memory
-from chatbot.tools.eopp_tool import initial_filtering_tool
+from chatbot.llm import get_chat_model
+from chatbot.tools.eopp_tool import initial_filtering_tool, match_eopp
 from chatbot.tools.cv_extraction_tool import cv_extraction_tool
 from chatbot.tools.information_rag_tool import query_data
 
+if TYPE_CHECKING:
+    from langchain.agents import AgentExecutor
+
 # Load environment variables
 load_dotenv()
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 
-tools = [query_data, initial_filtering_tool, cv_extraction_tool]
+tools = [query_data, initial_filtering_tool, match_eopp, cv_extraction_tool]
 
 
 def load_onboarding_questions() -> str:
@@ -26,8 +27,12 @@ def load_onboarding_questions() -> str:
     return onboarding_questions
 
 
-def setup_agent() -> AgentExecutor:
-    """Set up the main agent with all required tools and prompt."""
+def setup_agent(session_id: str = "local") -> "AgentExecutor":
+    """Set up the main agent with all required tools and prompt for one conversation."""
+    from langchain.agents import AgentExecutor, create_tool_calling_agent
+    from langchain_core.prompts import PromptTemplate
+    from chatbot.memory import get_agent_memory
+
     # Read the previously extracted CV details from file (if available)
     extracted_details_path = os.path.join("temp", "extracted_details.txt")
     if os.path.exists(extracted_details_path):
@@ -76,11 +81,13 @@ def setup_agent() -> AgentExecutor:
             ---
             Step 4: Matching the Best EOPP
             - Based on their preferences, suggest **the most suitable educational opportunities**.
-            - Use the **'match_eopp'** tool to provide tailored recommendations.
+            - Use the **'match_eopp'** tool to provide tailored recommendations, passing the confirmed qualification, GPA, IELTS, field and preferred location.
+            - Present only the shortlist it returns, explaining the reasons given for each course.
 
             ---
             Conversation Guidelines:
             - **If the user ask any information in the cv use **'cv_extraction_tool'** to answer for the question.**
+            - **When asking 'query_data' about a specific university or course, pass them as its filters.**
             - **Keep responses concise yet informative.**
             - **Engage with the user naturally**—avoid robotic responses.
             - **Ask one question at a time** to maintain a smooth flow.
@@ -101,14 +108,14 @@ def setup_agent() -> AgentExecutor:
     )
 
     # Set up the language model (using GPT-4o in this example)
-    agent_llm = ChatOpenAI(model="gpt-4o", temperature=0, streaming=True)
+    agent_llm = get_chat_model(model="gpt-4o", temperature=0, streaming=True)
 
     # Create the agent using the tool-calling agent builder
     agent = create_tool_calling_agent(agent_llm, tools, prompt)
     main_agent_executor = AgentExecutor(
         agent=agent,
         tools=tools,
-        memory=agent_memory,
+        memory=get_agent_memory(session_id),
         verbose=True,
         handle_parsing_errors=True,
         max_iterations=5,
@@ -1,4 +1,5 @@
 import os
+from chatbot.llm import get_chat_model
 
 
 def extract_cv_details(file_path: str) -> str:
@@ -7,7 +8,6 @@ def extract_cv_details(file_path: str) -> str:
     """
     from langchain_community.document_loaders import PyPDFLoader
     from langchain_core.prompts import ChatPromptTemplate
-    from langchain_openai import ChatOpenAI
     from langchain_core.output_parsers import StrOutputParser
 
     loader = PyPDFLoader(file_path)
@@ -61,7 +61,7 @@ def extract_cv_details(file_path: str) -> str:
         """
     )
 
-    model = ChatOpenAI()
+    model = get_chat_model()
     output_parser = StrOutputParser()
     chain = prompt | model | output_parser
     output = chain.invoke({"cv": cv})
@@ -71,3 +71,63 @@ def extract_cv_details(file_path: str) -> str:
         file.write(output)
 
     return output
+
+
+# Fields returned by extract_structured_cv_details (one spreadsheet column each in bulk ingestion)
+CV_DETAILS_SCHEMA = {
+    "title": "cv_details",
+    "description": "Details extracted from a student's CV. Use null for anything the CV does not state.",
+    "type": "object",
+    "properties": {
+        "name": {"type": ["string", "null"], "description": "Full name as per passport"},
+        "date_of_birth": {"type": ["string", "null"]},
+        "address": {"type": ["string", "null"], "description": "Address including the country"},
+        "contact_number": {"type": ["string", "null"], "description": "Phone number with country code"},
+        "email": {"type": ["string", "null"]},
+        "latest_qualification": {
+            "type": ["string", "null"],
+            "description": "One of: O-levels, A-Level, Bachelors, Masters, or the qualification name if none fit",
+        },
+        "qualification_date": {"type": ["string", "null"], "description": "Month and year of the latest qualification"},
+        "results": {
+            "type": ["string", "null"],
+            "description": "English, Maths and Science grades for O-levels/GCSE, or the full A-Level results",
+        },
+        "stream_of_study": {"type": ["string", "null"], "description": "For Bachelor's or Master's degrees"},
+        "gpa": {"type": ["string", "null"], "description": "For Bachelor's or Master's degrees"},
+        "field": {
+            "type": ["string", "null"],
+            "description": "Healthcare, Computer Science, Business, Engineering, Law, Arts & Humanities, "
+                           "Social Sciences, Agriculture & Environmental Science or Natural Sciences",
+        },
+        "english_qualification": {"type": ["string", "null"], "description": "IELTS / PTE result, if any"},
+    },
+    "required": [
+        "name", "date_of_birth", "address", "contact_number", "email", "latest_qualification",
+        "qualification_date", "results", "stream_of_study", "gpa", "field", "english_qualification",
+    ],
+    "additionalProperties": False,
+}
+
+
+def extract_structured_cv_details(cv_text: str) -> dict:
+    """
+    Extract the CV details as a dictionary following CV_DETAILS_SCHEMA.
+    Unlike extract_cv_details, this never asks follow-up questions and does not write to temp/.
+    """
+    from langchain_core.prompts import ChatPromptTemplate
+
+    prompt = ChatPromptTemplate.from_template(
+        """
+        Extract the candidate's details from the CV below. If a detail is not provided, return null for it.
+        Pick the field of study from the allowed options that best matches the candidate's qualifications.
+
+        Candidate CV:
+        {cv}
+        """
+    )
+
+    # json_schema structured output needs a model that supports it; the default gpt-3.5-turbo does not
+    model = get_chat_model(model="gpt-4o-mini", temperature=0).with_structured_output(CV_DETAILS_SCHEMA)
+    chain = prompt | model
+    return chain.invoke({"cv": cv_text})
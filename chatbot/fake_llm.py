@@ -0,0 +1,55 @@
+import re
+import time
+import hashlib
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# Tracer tokens let load tests follow data through the pipeline, e.g. "[tracer:1a2b3c4d]"
+TRACER_PATTERN = re.compile(r"\[tracer:[0-9a-f]+\]")
+
+
+def find_tracers(text):
+    """Return the set of tracer tokens contained in a piece of text."""
+    return set(TRACER_PATTERN.findall(str(text)))
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatOpenAI.
+
+    It echoes every tracer token found in the prompt. A prompt without tracers (e.g. CV extraction)
+    gets a new tracer derived from its content, so identical inputs always produce the same reply.
+    """
+
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self):
+        return "fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt = "\n".join(str(message.content) for message in messages)
+        tracers = find_tracers(prompt)
+        if not tracers:
+            tracers = {f"[tracer:{hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:12]}]"}
+
+        reply = f"Fake reply to a {len(prompt)}-character prompt. {' '.join(sorted(tracers))}"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply))])
+
+    def bind_tools(self, tools, **kwargs):
+        # The fake never calls tools, so binding them is a no-op
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        # Fill every field of a JSON schema with the tracers of the plain-text reply
+        from langchain_core.runnables import RunnableLambda
+
+        def respond(prompt):
+            tracers = " ".join(sorted(find_tracers(self.invoke(prompt).content)))
+            return {field: tracers for field in schema.get("properties", {})}
+
+        return RunnableLambda(respond)
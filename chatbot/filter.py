@@ -1,6 +1,3 @@
-import pandas as pd
-
-
 def initial_filtering(file_path, filters):
     """
     Performs an initial filtering of the courses based on key parameters.
@@ -9,6 +6,7 @@ def initial_filtering(file_path, filters):
     - Standard filtering using university name, field type, location, and degree program type.
     - Handles cases where a country name (e.g., "UK") is provided instead of a specific city.
     """
+    import pandas as pd
 
     # Load the Excel file
     df = pd.read_excel(file_path, sheet_name="Sheet1")
@@ -0,0 +1,197 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import message_to_dict, messages_from_dict
+
+# Pools are shared by every history object pointing at the same database file
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class SQLiteConnectionPool:
+    """A small thread-safe pool of SQLite connections opened in WAL mode."""
+
+    def __init__(self, db_path, size=5):
+        self.db_path = db_path
+        self._connections = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._connections.put(self._connect())
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def connection(self):
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+
+def get_sqlite_pool(db_path, size=5):
+    """Return the shared pool for a database file, creating the file and schema on first use."""
+    db_path = os.path.abspath(db_path)
+    with _pools_lock:
+        if db_path not in _pools:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            pool = SQLiteConnectionPool(db_path, size=size)
+            with pool.connection() as connection:
+                connection.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS chat_messages (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        session_id TEXT NOT NULL,
+                        message TEXT NOT NULL,
+                        created_at REAL NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_chat_messages_session ON chat_messages (session_id, id);
+                    """
+                )
+                connection.commit()
+            _pools[db_path] = pool
+        return _pools[db_path]
+
+
+class SQLiteChatMessageHistory(BaseChatMessageHistory):
+    """
+    Chat history stored in a SQLite database shared by every worker process on the host.
+
+    Args:
+        session_id (str): Conversation the messages belong to
+        db_path (str): Path to the SQLite database file
+        window (int, optional): Number of most recent messages returned by `messages`. None returns all.
+    """
+
+    def __init__(self, session_id, db_path, window=None):
+        self.session_id = session_id
+        self.window = window
+        self.pool = get_sqlite_pool(db_path)
+
+    @property
+    def messages(self):
+        if self.window is None:
+            return self.get_messages()
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT message FROM chat_messages WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (self.session_id, self.window),
+            ).fetchall()
+        return messages_from_dict([json.loads(row[0]) for row in reversed(rows)])
+
+    def get_messages(self, offset=0, limit=None):
+        """Return one page of the conversation, oldest first."""
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT message FROM chat_messages WHERE session_id = ? ORDER BY id LIMIT ? OFFSET ?",
+                (self.session_id, -1 if limit is None else limit, offset),
+            ).fetchall()
+        return messages_from_dict([json.loads(row[0]) for row in rows])
+
+    def count(self):
+        """Number of messages in the conversation."""
+        with self.pool.connection() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM chat_messages WHERE session_id = ?", (self.session_id,)
+            ).fetchone()[0]
+
+    def add_messages(self, messages):
+        now = time.time()
+        with self.pool.connection() as connection:
+            connection.executemany(
+                "INSERT INTO chat_messages (session_id, message, created_at) VALUES (?, ?, ?)",
+                [(self.session_id, json.dumps(message_to_dict(message)), now) for message in messages],
+            )
+            connection.commit()
+
+    def clear(self):
+        with self.pool.connection() as connection:
+            connection.execute("DELETE FROM chat_messages WHERE session_id = ?", (self.session_id,))
+            connection.commit()
+
+
+class LocalRedis:
+    """In-process stand-in for the subset of the Redis list API used by RedisChatMessageHistory."""
+
+    def __init__(self):
+        self._lists = {}
+        self._lock = threading.Lock()
+
+    def rpush(self, key, *values):
+        with self._lock:
+            items = self._lists.setdefault(key, [])
+            items.extend(values)
+            return len(items)
+
+    def lrange(self, key, start, end):
+        with self._lock:
+            items = self._lists.get(key, [])
+            # Redis ranges are inclusive and accept negative indexes
+            if start < 0:
+                start = max(len(items) + start, 0)
+            if end < 0:
+                end = len(items) + end
+            return list(items[start:end + 1])
+
+    def llen(self, key):
+        with self._lock:
+            return len(self._lists.get(key, []))
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._lists.pop(key, None) is not None for key in keys)
+
+
+class RedisChatMessageHistory(BaseChatMessageHistory):
+    """
+    Chat history stored as one Redis list per session, shared across hosts.
+
+    Args:
+        session_id (str): Conversation the messages belong to
+        client: A redis-py client, or any object with rpush/lrange/llen/delete (e.g. LocalRedis)
+        window (int, optional): Number of most recent messages returned by `messages`. None returns all.
+        key_prefix (str, optional): Prefix for the Redis keys
+    """
+
+    def __init__(self, session_id, client, window=None, key_prefix="chat_history:"):
+        self.session_id = session_id
+        self.client = client
+        self.window = window
+        self.key = f"{key_prefix}{session_id}"
+
+    def _load(self, items):
+        return messages_from_dict([
+            json.loads(item.decode("utf-8") if isinstance(item, bytes) else item) for item in items
+        ])
+
+    @property
+    def messages(self):
+        if self.window is None:
+            return self.get_messages()
+        return self._load(self.client.lrange(self.key, -self.window, -1))
+
+    def get_messages(self, offset=0, limit=None):
+        """Return one page of the conversation, oldest first."""
+        if limit == 0:
+            return []
+        end = -1 if limit is None else offset + limit - 1
+        return self._load(self.client.lrange(self.key, offset, end))
+
+    def count(self):
+        """Number of messages in the conversation."""
+        return self.client.llen(self.key)
+
+    def add_messages(self, messages):
+        if messages:
+            self.client.rpush(self.key, *[json.dumps(message_to_dict(message)) for message in messages])
+
+    def clear(self):
+        self.client.delete(self.key)
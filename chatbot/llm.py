@@ -0,0 +1,31 @@
+import os
+
+
+def get_llm_provider():
+    """Return the configured model provider: "openai" (default) or "fake" for offline runs."""
+    return os.environ.get("LLM_PROVIDER", "openai").strip().lower()
+
+
+def get_chat_model(**kwargs):
+    """Create the chat model for the configured provider. Keyword arguments are passed to ChatOpenAI."""
+    if get_llm_provider() == "fake":
+        from chatbot.fake_llm import FakeChatModel
+
+        return FakeChatModel(latency=float(os.environ.get("FAKE_LLM_LATENCY", "0")))
+
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(**kwargs)
+
+
+def get_embedding_model(**kwargs):
+    """Create the embedding model for the configured provider. Keyword arguments are passed to OpenAIEmbeddings."""
+    if get_llm_provider() == "fake":
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+
+        # Same dimension as text-embedding-3-small so fakes work against the real indexes
+        return DeterministicFakeEmbedding(size=1536)
+
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(**kwargs)
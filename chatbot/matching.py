@@ -0,0 +1,269 @@
+import re
+from functools import lru_cache
+
+# Points awarded by each criterion (a perfect match scores 100)
+LEVEL_WEIGHT = 40
+FIELD_WEIGHT = 25
+IELTS_WEIGHT = 15
+GRADE_WEIGHT = 10
+LOCATION_WEIGHT = 10
+
+# Latest qualification -> degree programs the student can progress to
+# (covers every degree_program value in the catalog that one of these qualifications leads to)
+NEXT_DEGREE_LEVELS = {
+    "o-levels": ["foundation", "a-level", "t-level"],
+    "a-level": ["bachelor's", "undergraduate", "beng", "honours", "higher national certificate"],
+    "bachelors": [
+        "master's", "masters", "postgraduate", "mres", "postgraduate certificate", "postgraduate diploma",
+        "pgcert", "pgce", "postgraduate certificate in education",
+    ],
+    "masters": ["phd", "doctorate"],
+}
+
+# UK honours classes, encoded so a higher number is a better degree
+DEGREE_CLASSES = {1: "third", 2: "2:2", 3: "2:1", 4: "first"}
+
+
+def normalize_qualification(qualification):
+    """Map free-text qualifications (e.g. "GCSE", "BSc") onto the keys of NEXT_DEGREE_LEVELS."""
+    if not qualification:
+        return None
+    text = str(qualification).strip().lower()
+    if any(word in text for word in ["o-level", "o level", "gcse"]):
+        return "o-levels"
+    if any(word in text for word in ["a-level", "a level", "advanced level"]):
+        return "a-level"
+    if any(word in text for word in ["master", "msc", "mba"]):
+        return "masters"
+    if any(word in text for word in ["bachelor", "bsc", "degree"]):
+        return "bachelors"
+    return None
+
+
+def parse_ielts(ielts):
+    """Return the overall IELTS band from a value like 6.5 or "6.5 overall", or None."""
+    match = re.search(r"\d+(?:\.\d+)?", str(ielts)) if ielts not in (None, "") else None
+    return float(match.group()) if match else None
+
+
+def _degree_class_from_text(text):
+    """Return the lowest honours class mentioned in a piece of text, or None."""
+    text = str(text).lower()
+    if "third" in text:
+        return 1
+    if any(word in text for word in ["2:2", "lower second", "second lower"]):
+        return 2
+    if any(word in text for word in ["2:1", "upper second", "second upper"]):
+        return 3
+    if "first" in text:
+        return 4
+    return None
+
+
+def gpa_to_degree_class(gpa):
+    """
+    Convert a GPA (4.0 or 10.0 scale), a percentage or an honours class into an approximate UK class.
+    Returns None when the value cannot be interpreted.
+    """
+    if gpa is None or str(gpa).strip() == "":
+        return None
+    degree_class = _degree_class_from_text(gpa)
+    if degree_class is not None:
+        return degree_class
+
+    match = re.search(r"\d+(?:\.\d+)?", str(gpa))
+    if not match:
+        return None
+    value = float(match.group())
+    if value <= 4.0:
+        thresholds = (3.7, 3.3, 3.0)
+    elif value <= 10:
+        thresholds = (8.5, 7.0, 6.0)
+    else:
+        thresholds = (70, 60, 50)
+    return 4 - sum(value < threshold for threshold in thresholds)
+
+
+@lru_cache(maxsize=4)
+def load_catalog(file_path):
+    """
+    Load the course catalog once and precompute the columns used for scoring.
+    The returned DataFrame is shared between calls and must not be modified.
+    """
+    import numpy as np
+    import pandas as pd
+
+    df = pd.read_excel(file_path, sheet_name="Sheet1")
+    df = df[df["course_or_degree_name"].notna()]
+
+    for col in ["university_name", "field_name", "location", "degree_program", "course_or_degree_name"]:
+        df[col] = df[col].astype(str).str.strip().str.lower()
+
+    # The catalog repeats some courses (e.g. per intake); merge the copies, keeping any requirement one of them lists
+    df = df.groupby(
+        ["university_name", "course_or_degree_name", "degree_program", "location"], sort=False, as_index=False
+    ).first()
+
+    # First number in the IELTS column is the overall band; ignore anything outside the band range
+    ielts = pd.to_numeric(df["ielts"].astype(str).str.extract(r"(\d+(?:\.\d+)?)")[0], errors="coerce")
+    df["min_ielts"] = ielts.where(ielts.between(3, 9))
+
+    required = df["bachelors_degree"].fillna("").astype(str).str.lower()
+    df["min_degree_class"] = np.select(
+        [
+            required.str.contains("third", regex=False),
+            required.str.contains(r"2:2|lower second|second lower"),
+            required.str.contains(r"2:1|upper second|second upper"),
+            required.str.contains("first", regex=False),
+        ],
+        [1, 2, 3, 4],
+        default=np.nan,
+    )
+    return df
+
+
+def score_courses(catalog, profile):
+    """
+    Score every course in the catalog against a student profile in a single vectorized pass.
+
+    Returns:
+        numpy.ndarray: One score (0-100) per catalog row
+    """
+    import numpy as np
+
+    n_courses = len(catalog)
+    scores = np.zeros(n_courses)
+
+    qualification = normalize_qualification(profile.get("latest qualification"))
+    if qualification:
+        levels = NEXT_DEGREE_LEVELS[qualification]
+        scores += LEVEL_WEIGHT * catalog["degree_program"].isin(levels).to_numpy()
+
+    field = (profile.get("field type") or "").strip().lower()
+    if field:
+        scores += FIELD_WEIGHT * (catalog["field_name"].to_numpy() == field)
+
+    location = (profile.get("location") or "").strip().lower()
+    if location and location != "uk":
+        scores += LOCATION_WEIGHT * (catalog["location"].to_numpy() == location)
+
+    # Unknown requirements earn half the points; failing a requirement earns none
+    ielts = parse_ielts(profile.get("ielts"))
+    if ielts is not None:
+        min_ielts = catalog["min_ielts"].to_numpy()
+        scores += np.where(np.isnan(min_ielts), IELTS_WEIGHT / 2, IELTS_WEIGHT * (ielts >= min_ielts))
+
+    degree_class = gpa_to_degree_class(profile.get("gpa"))
+    if degree_class is not None:
+        min_class = catalog["min_degree_class"].to_numpy()
+        scores += np.where(np.isnan(min_class), GRADE_WEIGHT / 2, GRADE_WEIGHT * (degree_class >= min_class))
+
+    return scores
+
+
+def meets_requirements(catalog, profile):
+    """
+    Flag the courses whose hard requirements the student satisfies: the degree level follows their
+    qualification, and their IELTS and degree class are not below a stated minimum.
+    Requirements that are not listed, or details the student has not given, never fail a course.
+
+    Returns:
+        numpy.ndarray: One boolean per catalog row
+    """
+    import numpy as np
+
+    eligible = np.ones(len(catalog), dtype=bool)
+
+    qualification = normalize_qualification(profile.get("latest qualification"))
+    if qualification:
+        eligible &= catalog["degree_program"].isin(NEXT_DEGREE_LEVELS[qualification]).to_numpy()
+
+    ielts = parse_ielts(profile.get("ielts"))
+    if ielts is not None:
+        min_ielts = catalog["min_ielts"].to_numpy()
+        eligible &= np.isnan(min_ielts) | (ielts >= min_ielts)
+
+    degree_class = gpa_to_degree_class(profile.get("gpa"))
+    if degree_class is not None:
+        min_class = catalog["min_degree_class"].to_numpy()
+        eligible &= np.isnan(min_class) | (degree_class >= min_class)
+
+    return eligible
+
+
+def explain_match(course, profile):
+    """Build the human-readable reasons for a single shortlisted course."""
+    reasons = []
+
+    qualification = normalize_qualification(profile.get("latest qualification"))
+    if qualification:
+        if course["degree_program"] in NEXT_DEGREE_LEVELS[qualification]:
+            reasons.append(f"{course['degree_program']} is the next step after {qualification}")
+        else:
+            reasons.append(f"{course['degree_program']} is not the usual next step after {qualification}")
+
+    field = (profile.get("field type") or "").strip().lower()
+    if field and course["field_name"] == field:
+        reasons.append(f"in your field ({field})")
+
+    location = (profile.get("location") or "").strip().lower()
+    if location and location != "uk" and course["location"] == location:
+        reasons.append(f"located in {location}")
+
+    ielts = parse_ielts(profile.get("ielts"))
+    if ielts is not None:
+        if course["min_ielts"] != course["min_ielts"]:
+            reasons.append("IELTS requirement not listed")
+        elif ielts >= course["min_ielts"]:
+            reasons.append(f"IELTS {ielts:g} meets {course['min_ielts']:g}")
+        else:
+            reasons.append(f"IELTS {ielts:g} below required {course['min_ielts']:g}")
+
+    degree_class = gpa_to_degree_class(profile.get("gpa"))
+    if degree_class is not None and course["min_degree_class"] == course["min_degree_class"]:
+        required = DEGREE_CLASSES[int(course["min_degree_class"])]
+        if degree_class >= course["min_degree_class"]:
+            reasons.append(f"GPA meets the {required} requirement")
+        else:
+            reasons.append(f"GPA below the {required} requirement")
+
+    return reasons
+
+
+def match_courses(file_path, profile, top_k=10):
+    """
+    Rank every course for a student profile and return the top-K with reasons.
+
+    Profile keys (all optional):
+    - "latest qualification": e.g. "A-Level", "Bachelors"
+    - "gpa": e.g. "3.4", "2:1", "68%"
+    - "ielts": overall band, e.g. 6.5
+    - "field type": e.g. "computer science"
+    - "location": e.g. "london" ("uk" means anywhere)
+    """
+    import numpy as np
+
+    catalog = load_catalog(file_path)
+    scores = score_courses(catalog, profile)
+    eligible = meets_requirements(catalog, profile)
+
+    # Nothing in the profile could be matched (e.g. an empty profile): no ranking is meaningful
+    top_k = min(top_k, len(scores))
+    if top_k <= 0 or scores.max() <= 0:
+        return catalog.iloc[0:0]
+
+    # Courses failing a hard requirement rank below every course that passes (scores are at most 100)
+    ranking = np.where(eligible, scores, scores - 101)
+
+    # Partial sort: only the shortlist is fully ordered
+    candidates = np.argpartition(-ranking, top_k - 1)[:top_k]
+    top = candidates[np.argsort(-ranking[candidates], kind="stable")]
+
+    shortlist = catalog.iloc[top][
+        ["university_name", "course_or_degree_name", "degree_program", "location", "field_name",
+         "min_ielts", "min_degree_class"]
+    ].copy()
+    shortlist["score"] = scores[top].round(1)
+    shortlist["eligible"] = eligible[top]
+    shortlist["reasons"] = [explain_match(row, profile) for _, row in shortlist.iterrows()]
+    return shortlist.reset_index(drop=True)
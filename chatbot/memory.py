@@ -1,6 +1,46 @@
-from langchain.memory import ConversationBufferMemory
-from langchain_community.chat_message_histories import StreamlitChatMessageHistory
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
 
-memory_storage = StreamlitChatMessageHistory(key="chat_messages")
+# Load environment variables
+load_dotenv()
 
-agent_memory = ConversationBufferMemory(memory_key="chat_history", human_prefix="user", chat_memory=memory_storage)
+# "sqlite" (default) or "redis"
+CHAT_HISTORY_BACKEND = os.environ.get("CHAT_HISTORY_BACKEND", "sqlite").strip().lower()
+CHAT_HISTORY_DB = os.environ.get("CHAT_HISTORY_DB", "chatbot/data/chat_history.sqlite3")
+# Number of recent messages the agent reads back on each turn. Unset means the whole conversation,
+# which the onboarding flow needs: answers given early (qualification, GPA, field) are used at the end.
+CHAT_HISTORY_WINDOW = int(os.environ["CHAT_HISTORY_WINDOW"]) if os.environ.get("CHAT_HISTORY_WINDOW") else None
+REDIS_URL = os.environ.get("REDIS_URL")
+
+
+@lru_cache(maxsize=1)
+def get_redis_client():
+    """Connect to REDIS_URL, or fall back to an in-process stand-in when it is not configured."""
+    from chatbot.history import LocalRedis
+
+    if not REDIS_URL:
+        return LocalRedis()
+    import redis
+
+    return redis.Redis.from_url(REDIS_URL)
+
+
+def get_message_history(session_id, window=CHAT_HISTORY_WINDOW):
+    """Return the configured chat history backend for one conversation."""
+    from chatbot.history import RedisChatMessageHistory, SQLiteChatMessageHistory
+
+    if CHAT_HISTORY_BACKEND == "redis":
+        return RedisChatMessageHistory(session_id, get_redis_client(), window=window)
+    if CHAT_HISTORY_BACKEND == "sqlite":
+        return SQLiteChatMessageHistory(session_id, CHAT_HISTORY_DB, window=window)
+    raise ValueError(f"Unknown CHAT_HISTORY_BACKEND: {CHAT_HISTORY_BACKEND}")
+
+
+def get_agent_memory(session_id):
+    """Build the agent's conversation memory for one conversation."""
+    from langchain.memory import ConversationBufferMemory
+
+    return ConversationBufferMemory(
+        memory_key="chat_history", human_prefix="user", chat_memory=get_message_history(session_id)
+    )
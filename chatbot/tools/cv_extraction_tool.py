@@ -1,7 +1,6 @@
 import os
 import glob
-import PyPDF2
-from langchain.tools import Tool
+from langchain_core.tools import Tool
 
 # Memory dictionary to store extracted details
 extracted_qualifications_memory = {}
@@ -22,6 +21,8 @@ def get_latest_cv():
 
 def extract_text_from_pdf(pdf_path):
     """Extracts text from a PDF file."""
+    import PyPDF2
+
     try:
         with open(pdf_path, "rb") as file:
             reader = PyPDF2.PdfReader(file)
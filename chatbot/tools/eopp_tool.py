@@ -1,6 +1,7 @@
 import json
-from langchain.tools import tool
+from langchain_core.tools import tool
 from chatbot.filter import initial_filtering
+from chatbot.matching import match_courses
 
 """
 @tool()
@@ -77,6 +78,10 @@ def initial_filtering_tool(filters_json: str, latest_qualification: str = None)
     if filtered_df.empty:
         return "No matching results found."
 
+    # Course-name-only queries return just the universities offering the course
+    if "course_or_degree_name" not in filtered_df.columns:
+        return ", ".join(filtered_df["university_name"])
+
     courses_and_universities = [
         f"{row['university_name']} - {row['course_or_degree_name']}"
         for _, row in filtered_df.iterrows()
@@ -84,3 +89,51 @@ def initial_filtering_tool(filters_json: str, latest_qualification: str = None)
 
     # Join the results into a comma-separated string
     return ", ".join(courses_and_universities)
+
+
+@tool()
+def match_eopp(profile_json: str, top_k: int = 10) -> str:
+    """
+    Ranks every course in the catalog against the student's profile and returns a shortlist.
+
+    Parameters:
+    - profile_json (str): JSON string with the student's confirmed details:
+      - Latest Qualification: "O-levels", "A-Level", "Bachelors" or "Masters"
+      - GPA: e.g. "3.4", "2:1", "68%" (for Bachelors/Masters holders)
+      - IELTS: overall band, e.g. 6.5
+      - Field Type: e.g. "computer science", "business"
+      - Location: e.g. "london", "birmingham" ("uk" for anywhere)
+    - top_k (int, optional): Number of courses to return. Defaults to 10.
+
+    Usage:
+    {
+        "latest qualification": "Bachelors",
+        "gpa": "3.4",
+        "ielts": 6.5,
+        "field type": "computer science",
+        "location": "london"
+    }
+
+    Returns:
+    - A numbered list of the best-matching courses with a score out of 100 and the reasons for it.
+      Courses whose entry requirements the student does not meet are listed last and marked as such.
+    """
+
+    try:
+        profile = {key.strip().lower(): value for key, value in json.loads(profile_json).items()}
+        print("Profile received:", profile)
+    except Exception as e:
+        return f"Error parsing profile JSON: {e}"
+
+    file_path = "chatbot/data/processed/updated_data.xlsx"
+    shortlist = match_courses(file_path, profile, top_k=top_k)
+
+    if shortlist.empty:
+        return "No matching results found."
+
+    return "\n".join(
+        f"{rank}. {row['university_name']} - {row['course_or_degree_name']} "
+        f"({row['degree_program']}, {row['location']}) - score {row['score']:g}/100"
+        f"{'' if row['eligible'] else ' (requirements not met)'}: {'; '.join(row['reasons'])}"
+        for rank, (_, row) in enumerate(shortlist.iterrows(), start=1)
+    )
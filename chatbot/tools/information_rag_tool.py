@@ -1,35 +1,128 @@
 import os
-from langchain.agents import tool
-from langchain_chroma import Chroma
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+import logging
+from functools import lru_cache
+from langchain_core.tools import tool
 from dotenv import load_dotenv
+from chatbot.llm import get_chat_model, get_embedding_model
 
 # Load environment variables
 load_dotenv()
 
-from langchain.agents import tool
-from langchain_chroma import Chroma
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+CHROMA_PERSIST_DIRECTORY = os.environ.get("CHROMA_PERSIST_DIRECTORY", "../chroma_db")
+# Folder holding the memory-mapped copy of the "spec" collection (see chatbot/utils/export_vector_index.py)
+VECTOR_INDEX_DIR = os.environ.get("VECTOR_INDEX_DIR", "chatbot/data/vector_index")
 
 
-@tool
-def query_data(input_string: str):
-    """Use this tool to query knowledge base to answer questions about courses."""
-    chroma_embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-    model = ChatOpenAI(model_name="gpt-4o-mini", streaming=True)
-
-    chroma_db = Chroma(
-        persist_directory="../chroma_db",
-        embedding_function=chroma_embeddings,
+@lru_cache(maxsize=1)
+def get_embeddings():
+    """Create the query embedding model on first use."""
+    return get_embedding_model(model="text-embedding-3-small")
+
+
+@lru_cache(maxsize=1)
+def get_chroma_db():
+    """Open the course knowledge base on first use and reuse it afterwards."""
+    from langchain_chroma import Chroma
+
+    return Chroma(
+        persist_directory=CHROMA_PERSIST_DIRECTORY,
+        embedding_function=get_embeddings(),
         collection_name="spec",
     )
-    retriever = chroma_db.as_retriever(search_kwargs={'k': 4})
+
+
+# Chunks retrieved per question: fewer are needed once the search is narrowed to a university or course
+DEFAULT_K = 4
+FILTERED_K = 3
+COURSE_FILTERED_K = 2
+
+DEGREE_LEVEL_ALIASES = {"bachelors": "bachelor's", "bachelor": "bachelor's", "masters": "master's", "master": "master's"}
+
+
+@lru_cache(maxsize=1)
+def get_university_names():
+    """Universities in the course catalog, lowercased as in the chunk metadata."""
+    from chatbot.matching import load_catalog
+
+    catalog = load_catalog("chatbot/data/processed/updated_data.xlsx")
+    return sorted({name for name in catalog["university_name"] if isinstance(name, str) and name != "nan"})
+
+
+def resolve_university(name):
+    """Map a short university name such as "Westminster" onto its catalog name when it is unambiguous."""
+    name = name.strip().lower()
+    universities = get_university_names()
+    if name in universities:
+        return name
+    matches = [university for university in universities if name in university]
+    return matches[0] if len(matches) == 1 else name
+
+
+def build_metadata_filter(university=None, course=None, degree_level=None):
+    """Build an exact-match metadata filter from the optional query_data arguments."""
+    where = {}
+    if university:
+        where["university"] = resolve_university(university)
+    if course:
+        where["course"] = course.strip().lower()
+    if degree_level:
+        level = degree_level.strip().lower()
+        where["degree_level"] = DEGREE_LEVEL_ALIASES.get(level, level)
+    return where
+
+
+def retrieve_documents(question, k=DEFAULT_K, where=None):
+    """
+    Retrieve the k most relevant chunks for a question, optionally restricted to chunks whose
+    metadata matches `where` (e.g. {"university": "university of westminster"}).
+    Uses the memory-mapped index when it has been exported and falls back to Chroma otherwise.
+    """
+    from langchain_core.documents import Document
+    from chatbot.vector_index import load_vector_index
+
+    index = load_vector_index(VECTOR_INDEX_DIR, "spec")
+    if index is not None:
+        try:
+            hits = index.search(get_embeddings().embed_query(question), k=k, where=where)
+            return [Document(page_content=text, metadata=metadata or {}) for _, text, metadata in hits]
+        except Exception as e:
+            logging.warning(f"Vector index search failed, falling back to Chroma: {e}")
+
+    if not where:
+        chroma_filter = None
+    elif len(where) == 1:
+        chroma_filter = where
+    else:
+        chroma_filter = {"$and": [{key: value} for key, value in where.items()]}
+    return get_chroma_db().similarity_search(question, k=k, filter=chroma_filter)
+
+
+@tool
+def query_data(input_string: str, university: str = None, course: str = None, degree_level: str = None):
+    """
+    Use this tool to query knowledge base to answer questions about courses.
+
+    Narrow the search whenever the question is about a specific university or course:
+    - university (optional): e.g. "university of westminster" (short names like "westminster" also work)
+    - course (optional): course name exactly as returned by 'initial_filtering_tool' or 'match_eopp'
+    - degree_level (optional): "bachelor's", "master's", "foundation" or "phd"
+    """
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.runnables import RunnablePassthrough
+
+    model = get_chat_model(model_name="gpt-4o-mini", streaming=True)
+
+    where = build_metadata_filter(university, course, degree_level)
+    k = COURSE_FILTERED_K if "course" in where else FILTERED_K if where else DEFAULT_K
+
+    def get_context(question):
+        documents = retrieve_documents(question, k=k, where=where)
+        if not documents and where:
+            # Nothing indexed for these filters (e.g. an untagged collection): search everything instead
+            logging.info(f"No chunks match {where}, retrying without filters.")
+            documents = retrieve_documents(question, k=DEFAULT_K)
+        return "\n\n".join(document.page_content for document in documents)
 
     template = """You are given a question and some extracted parts from several documentation that can be used to answer the question.
     Give complete detailed answer.
@@ -43,7 +136,7 @@ def query_data(input_string: str):
     prompt = ChatPromptTemplate.from_template(template)
 
     chain = (
-            {"context": retriever, "question": RunnablePassthrough()}
+            {"context": get_context, "question": RunnablePassthrough()}
             | prompt
             | model
             | StrOutputParser()
@@ -0,0 +1,225 @@
+import os
+import csv
+import time
+import hashlib
+import logging
+import zipfile
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from chatbot.analyze_cv import CV_DETAILS_SCHEMA
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+STATUS_COLUMNS = ["file", "sha256", "status", "error"]
+OUTPUT_COLUMNS = STATUS_COLUMNS + list(CV_DETAILS_SCHEMA["properties"])
+
+
+class RateLimiter:
+    """Spaces out calls so that no more than `per_minute` start in any minute, across threads."""
+
+    def __init__(self, per_minute):
+        self.interval = 60 / per_minute if per_minute else 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+
+def collect_pdfs(source, scratch_dir):
+    """
+    List the PDFs in a folder (recursively) or a zip archive.
+
+    Returns:
+        list: (name, path) tuples, where name is the path relative to the folder or inside the zip
+    """
+    if zipfile.is_zipfile(source):
+        pdfs = []
+        with zipfile.ZipFile(source) as archive:
+            for index, member in enumerate(archive.infolist()):
+                if member.is_dir() or not member.filename.lower().endswith(".pdf"):
+                    continue
+                # Never trust member paths: extract under a generated name
+                path = os.path.join(scratch_dir, f"{index}.pdf")
+                with archive.open(member) as src, open(path, "wb") as dst:
+                    dst.write(src.read())
+                pdfs.append((member.filename, path))
+        return pdfs
+
+    if not os.path.isdir(source):
+        raise ValueError(f"{source} is neither a folder nor a zip file.")
+    return [
+        (os.path.relpath(os.path.join(folder, filename), source), os.path.join(folder, filename))
+        for folder, _, files in sorted(os.walk(source))
+        for filename in sorted(files)
+        if filename.lower().endswith(".pdf")
+    ]
+
+
+def file_sha256(path):
+    """Hash a file's content so the same CV uploaded twice is only processed once."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_pdf_text(path):
+    """
+    Extract the text of a PDF. Runs in a worker process.
+
+    Returns:
+        tuple: (text, error) - exactly one of them is None
+    """
+    import PyPDF2
+
+    try:
+        with open(path, "rb") as file:
+            reader = PyPDF2.PdfReader(file)
+            text = " ".join(page.extract_text() or "" for page in reader.pages).strip()
+    except Exception as e:
+        return None, f"Error extracting text: {e}"
+    if not text:
+        return None, "No text extracted from PDF (scanned image?)."
+    return text, None
+
+
+def load_progress(output_path):
+    """
+    Read what a previous run already recorded, so it is not done or written again.
+
+    Returns:
+        tuple: (hashes extracted successfully, (file, sha256) pairs already recorded as duplicates)
+    """
+    if not os.path.exists(output_path):
+        return set(), set()
+    completed, duplicates = set(), set()
+    with open(output_path, "r", newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            if row["status"] == "ok":
+                completed.add(row["sha256"])
+            elif row["status"] == "duplicate":
+                duplicates.add((row["file"], row["sha256"]))
+    return completed, duplicates
+
+
+def extract_with_retries(text, rate_limiter, retries):
+    """Call the LLM extraction, backing off exponentially after failures (e.g. rate-limit errors)."""
+    from chatbot.analyze_cv import extract_structured_cv_details
+
+    for attempt in range(retries + 1):
+        rate_limiter.wait()
+        try:
+            return extract_structured_cv_details(text)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(2 ** attempt)
+
+
+def ingest(source, output_path, workers=None, concurrency=4, requests_per_minute=60, retries=2):
+    """
+    Extract the details of every CV in a folder or zip file into a CSV file, one row per PDF.
+
+    Rows are appended as soon as each CV finishes, so an interrupted run can be resumed:
+    CVs already extracted successfully or already recorded as duplicates are skipped, failed ones
+    are retried and get a new row (the last row for a file is the current one).
+
+    Args:
+        source (str): Folder or zip file of PDFs
+        output_path (str): CSV file to append to
+        workers (int, optional): Processes used to parse PDFs. Defaults to the CPU count
+        concurrency (int, optional): LLM calls in flight at once. Defaults to 4
+        requests_per_minute (int, optional): LLM call rate limit, 0 for none. Defaults to 60
+        retries (int, optional): Retries per CV after a failed LLM call. Defaults to 2
+
+    Returns:
+        dict: Number of files per status
+    """
+    counts = {"ok": 0, "error": 0, "duplicate": 0, "skipped": 0}
+    completed, recorded_duplicates = load_progress(output_path)
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        pdfs = collect_pdfs(source, scratch_dir)
+        logging.info(f"Found {len(pdfs)} PDFs in {source}")
+
+        is_new_file = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        with open(output_path, "a", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS, extrasaction="ignore")
+            if is_new_file:
+                writer.writeheader()
+
+            def write_row(name, sha256, status, error=None, details=None):
+                writer.writerow({"file": name, "sha256": sha256, "status": status, "error": error, **(details or {})})
+                file.flush()
+                counts[status] += 1
+                if status == "error":
+                    logging.error(f"{name}: {error}")
+
+            # Deduplicate by content before doing any parsing
+            first_seen = {}
+            pending = []
+            for name, path in pdfs:
+                sha256 = file_sha256(path)
+                if sha256 in completed or (name, sha256) in recorded_duplicates:
+                    counts["skipped"] += 1
+                elif sha256 in first_seen:
+                    write_row(name, sha256, "duplicate", f"Same content as {first_seen[sha256]}")
+                else:
+                    first_seen[sha256] = name
+                    pending.append((name, path, sha256))
+            logging.info(f"{len(pending)} CVs to extract, {counts['skipped']} already done, "
+                         f"{counts['duplicate']} duplicates")
+
+            rate_limiter = RateLimiter(requests_per_minute)
+            with ProcessPoolExecutor(max_workers=workers) as parsers, \
+                    ThreadPoolExecutor(max_workers=concurrency) as extractors:
+                futures = {}
+                parsed = parsers.map(read_pdf_text, [path for _, path, _ in pending], chunksize=4)
+                for (name, _, sha256), (text, error) in zip(pending, parsed):
+                    if error:
+                        write_row(name, sha256, "error", error)
+                    else:
+                        futures[extractors.submit(extract_with_retries, text, rate_limiter, retries)] = (name, sha256)
+
+                for future in as_completed(futures):
+                    name, sha256 = futures[future]
+                    try:
+                        write_row(name, sha256, "ok", details=future.result())
+                    except Exception as e:
+                        write_row(name, sha256, "error", f"Extraction failed: {e}")
+
+    return counts
+
+
+def main():
+    """Run from the repository root: python -m chatbot.utils.bulk_cv_ingest CVs.zip cv_details.csv"""
+    parser = argparse.ArgumentParser(description="Extract the details of a batch of CVs into a CSV file.")
+    parser.add_argument("source", help="Folder or zip file of PDF CVs")
+    parser.add_argument("output", help="CSV file to write (appended to and resumed if it exists)")
+    parser.add_argument("--workers", type=int, default=None, help="PDF parsing processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=4, help="LLM calls in flight at once")
+    parser.add_argument("--requests-per-minute", type=int, default=60, help="LLM call rate limit (0 for none)")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per CV after a failed LLM call")
+    args = parser.parse_args()
+
+    counts = ingest(args.source, args.output, workers=args.workers, concurrency=args.concurrency,
+                    requests_per_minute=args.requests_per_minute, retries=args.retries)
+    logging.info(f"Done: {counts['ok']} extracted, {counts['error']} failed, {counts['duplicate']} duplicates, "
+                 f"{counts['skipped']} skipped (already recorded). Results in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
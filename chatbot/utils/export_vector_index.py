@@ -0,0 +1,35 @@
+import logging
+import argparse
+from dotenv import load_dotenv
+from chatbot.tools.information_rag_tool import CHROMA_PERSIST_DIRECTORY, VECTOR_INDEX_DIR
+from chatbot.vector_index import export_collection
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def main():
+    """Run from the repository root: python -m chatbot.utils.export_vector_index [--int8]"""
+    parser = argparse.ArgumentParser(description="Export a Chroma collection to a memory-mapped vector index.")
+    parser.add_argument("--persist-directory", default=CHROMA_PERSIST_DIRECTORY,
+                        help="Chroma persist directory (defaults to CHROMA_PERSIST_DIRECTORY)")
+    parser.add_argument("--collection", default="spec", help="Collection to export")
+    parser.add_argument("--out-dir", default=VECTOR_INDEX_DIR,
+                        help="Folder for the exported index (defaults to VECTOR_INDEX_DIR)")
+    parser.add_argument("--int8", action="store_true", help="Quantize the vectors to int8")
+    args = parser.parse_args()
+
+    from langchain_chroma import Chroma
+
+    logging.info(f"Opening collection '{args.collection}' in {args.persist_directory}")
+    chroma_db = Chroma(persist_directory=args.persist_directory, collection_name=args.collection)
+
+    count = export_collection(chroma_db, args.out_dir, name=args.collection, quantize=args.int8)
+    logging.info(f"Exported {count} vectors to {args.out_dir} ({'int8' if args.int8 else 'float32'}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import re
+import subprocess
+import sys
+import argparse
+
+# Repository root (this file lives in chatbot/utils/)
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Modules the chat page must be able to import without paying for
+HEAVY_MODULES = [
+    "langchain.agents",
+    "langchain_openai",
+    "langchain_chroma",
+    "chromadb",
+    "pandas",
+    "PyPDF2",
+]
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_imports(module_name):
+    """
+    Import a module in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) tuples in import order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module_name} failed:\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the import-time cost of the chat page modules.")
+    parser.add_argument("--module", action="append", help="Module to profile (repeatable)")
+    parser.add_argument("--max-ms", type=float, default=1500.0, help="Fail if a module takes longer to import")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    modules = args.module or ["chatbot.agent", "chatbot.analyze_cv", "chatbot.memory"]
+    failures = []
+
+    for module_name in modules:
+        entries = profile_imports(module_name)
+        total_ms = next(cumulative for name, _, cumulative, _ in entries if name == module_name) / 1000
+        loaded = {name for name, _, _, _ in entries}
+
+        print(f"\n{module_name}: {total_ms:.1f} ms ({len(entries)} modules)")
+        for name, _, cumulative, depth in sorted(entries, key=lambda e: e[2], reverse=True)[:args.top]:
+            print(f"  {cumulative / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+        if total_ms > args.max_ms:
+            failures.append(f"{module_name} took {total_ms:.1f} ms (limit {args.max_ms:.0f} ms)")
+        for heavy in HEAVY_MODULES:
+            if heavy in loaded:
+                failures.append(f"{module_name} eagerly imports {heavy}")
+
+    if failures:
+        print("\n❌ Import profile check failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ Import profile within limits.")
+
+
+if __name__ == "__main__":
+    main()
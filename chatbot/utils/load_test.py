@@ -0,0 +1,287 @@
+import os
+import sys
+import json
+import math
+import glob
+import time
+import uuid
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import contextlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Repository root (this file lives in chatbot/utils/)
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Scripted conversation every simulated student goes through
+ONBOARDING_ANSWERS = [
+    "Yes, those details are correct.",
+    "My latest qualification is a Bachelor's degree in Computer Science, completed in June 2024.",
+    "My GPA is 3.4 and I do not need to bring dependents.",
+    "I want to apply for computer science.",
+    "I would prefer to study in London, starting in September.",
+    "I have IELTS 6.5.",
+]
+FILTER_QUERIES = [
+    {"field type": "computer science", "degree program type": "master's"},
+    {"university name": "university of westminster", "field type": "business"},
+    {"course name": "nursing"},
+]
+MATCH_PROFILE = {
+    "latest qualification": "Bachelors",
+    "gpa": "3.4",
+    "ielts": 6.5,
+    "field type": "computer science",
+    "location": "london",
+}
+RAG_QUESTIONS = [
+    "What are the entry requirements for computer science master's courses?",
+    "Which courses accept an IELTS score of 6.0?",
+]
+
+
+class Recorder:
+    """Thread-safe collection of per-operation latencies."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def timed(self, operation):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latencies[operation].append(elapsed)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def prepare_workspace(workspace, history_backend):
+    """
+    Point the app at a scratch copy of its working directory so a run never touches the real
+    temp/ folder, chat history or vector store. Must run before any chatbot module is imported.
+    """
+    for name in ["chatbot", "docs"]:
+        os.symlink(os.path.join(REPO_ROOT, name), os.path.join(workspace, name))
+    os.makedirs(os.path.join(workspace, "temp"))
+
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ.setdefault("OPENAI_API_KEY", "load-test")
+    os.environ["CHAT_HISTORY_BACKEND"] = history_backend
+    os.environ["CHAT_HISTORY_DB"] = os.path.join(workspace, "chat_history.sqlite3")
+    os.environ["CHROMA_PERSIST_DIRECTORY"] = os.path.join(workspace, "chroma_db")
+    os.environ["VECTOR_INDEX_DIR"] = os.path.join(workspace, "vector_index")
+    os.environ.pop("REDIS_URL", None)
+    os.chdir(workspace)
+
+
+def seed_knowledge_base(file_path):
+    """Fill the scratch "spec" collection with one fake-embedded document per catalog course."""
+    from langchain_chroma import Chroma
+    from chatbot.llm import get_embedding_model
+    from chatbot.matching import load_catalog
+
+    catalog = load_catalog(file_path)
+    texts = [
+        f"{row.university_name} offers {row.course_or_degree_name} ({row.degree_program}) in {row.location}. "
+        f"Field: {row.field_name}. Minimum IELTS: {row.min_ielts}."
+        for row in catalog.itertuples()
+    ]
+    Chroma.from_texts(
+        texts,
+        embedding=get_embedding_model(),
+        collection_name="spec",
+        persist_directory=os.environ["CHROMA_PERSIST_DIRECTORY"],
+    )
+    return len(texts)
+
+
+def run_session(index, fixtures, expected, recorder):
+    """
+    Simulate one student: upload a CV, answer the onboarding questions, then ask filter,
+    matching and knowledge-base questions. Every input carries a tracer unique to the session
+    so that data belonging to another session can be spotted in the replies.
+    """
+    from chatbot.agent import setup_agent
+    from chatbot.analyze_cv import extract_cv_details
+    from chatbot.fake_llm import find_tracers
+    from chatbot.memory import get_message_history
+    from chatbot.tools.eopp_tool import initial_filtering_tool, match_eopp
+    from chatbot.tools.information_rag_tool import query_data
+
+    session_id = uuid.uuid4().hex
+    token = f"[tracer:{session_id[:12]}]"
+    fixture = fixtures[index % len(fixtures)]
+    result = {"session": index, "fixture": os.path.basename(fixture), "leaks": [], "failures": []}
+
+    try:
+        # Same destination as pages/page2.py
+        upload_path = os.path.join("temp", os.path.basename(fixture))
+        with recorder.timed("upload_cv"):
+            shutil.copyfile(fixture, upload_path)
+        with recorder.timed("extract_cv"):
+            cv_tracers = find_tracers(extract_cv_details(upload_path))
+        if cv_tracers != expected["cv"][fixture]:
+            result["leaks"].append("CV extraction returned another CV's details")
+
+        for answer in ONBOARDING_ANSWERS:
+            with recorder.timed("agent_turn"):
+                reply = setup_agent(session_id).invoke({"input": f"{answer} {token}"})["output"]
+            seen = find_tracers(reply)
+            if seen - cv_tracers - {token}:
+                result["leaks"].append(f"agent reply contains foreign data: {sorted(seen - cv_tracers - {token})}")
+            if not cv_tracers <= seen:
+                result["leaks"].append("agent prompt is missing this session's CV details")
+
+        for filters in FILTER_QUERIES:
+            with recorder.timed("filter_tool"):
+                output = initial_filtering_tool.invoke({"filters_json": json.dumps(filters)})
+            if output != expected["filters"][json.dumps(filters)]:
+                result["failures"].append(f"initial_filtering_tool returned a different result for {filters}")
+
+        with recorder.timed("match_tool"):
+            output = match_eopp.invoke({"profile_json": json.dumps(MATCH_PROFILE)})
+        if output != expected["match"]:
+            result["failures"].append("match_eopp returned a different shortlist")
+
+        for question in RAG_QUESTIONS:
+            with recorder.timed("rag_query"):
+                reply = query_data.invoke(f"{question} {token}")
+            if find_tracers(reply) != {token}:
+                result["leaks"].append(f"knowledge-base answer contains foreign data: {sorted(find_tracers(reply))}")
+
+        with recorder.timed("history_read"):
+            history = get_message_history(session_id, window=None).messages
+        if len(history) != 2 * len(ONBOARDING_ANSWERS):
+            result["failures"].append(f"expected {2 * len(ONBOARDING_ANSWERS)} history messages, found {len(history)}")
+        if any(token not in message.content for message in history if message.type == "human"):
+            result["leaks"].append("chat history contains another session's messages")
+    except Exception as e:
+        result["failures"].append(f"{type(e).__name__}: {e}")
+
+    return result
+
+
+def compute_expected(fixtures):
+    """Run every scripted step once, single-threaded, to get the reference answers."""
+    from chatbot.fake_llm import find_tracers
+    from chatbot.analyze_cv import extract_cv_details
+    from chatbot.tools.eopp_tool import initial_filtering_tool, match_eopp
+
+    expected = {"cv": {}, "filters": {}}
+    for fixture in fixtures:
+        upload_path = os.path.join("temp", os.path.basename(fixture))
+        shutil.copyfile(fixture, upload_path)
+        expected["cv"][fixture] = find_tracers(extract_cv_details(upload_path))
+    for filters in FILTER_QUERIES:
+        expected["filters"][json.dumps(filters)] = initial_filtering_tool.invoke({"filters_json": json.dumps(filters)})
+    expected["match"] = match_eopp.invoke({"profile_json": json.dumps(MATCH_PROFILE)})
+    return expected
+
+
+def print_report(results, recorder, wall_time, n_sessions, concurrency):
+    total_ops = sum(len(values) for values in recorder.latencies.values())
+    print(f"\nSessions: {n_sessions} (concurrency {concurrency}), wall time {wall_time:.2f} s")
+    print(f"Throughput: {total_ops / wall_time:.1f} operations/s, {n_sessions / wall_time * 60:.1f} sessions/min")
+
+    print(f"\n{'operation':<14}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for operation, values in recorder.latencies.items():
+        print(
+            f"{operation:<14}{len(values):>7}"
+            f"{percentile(values, 50) * 1000:>10.1f}{percentile(values, 95) * 1000:>10.1f}"
+            f"{percentile(values, 99) * 1000:>10.1f}{max(values) * 1000:>10.1f}"
+        )
+
+    rss = peak_rss_mb()
+    if rss is not None:
+        print(f"\nPeak RSS: {rss:.1f} MB")
+
+    leaking = [result for result in results if result["leaks"]]
+    failing = [result for result in results if result["failures"]]
+    print(f"\nSessions with cross-session leakage: {len(leaking)}/{n_sessions}")
+    print(f"Sessions with failures: {len(failing)}/{n_sessions}")
+    for result in {result["session"]: result for result in leaking + failing}.values():
+        for problem in dict.fromkeys(result["leaks"] + result["failures"]):
+            print(f"  - session {result['session']} ({result['fixture']}): {problem}")
+    return not leaking and not failing
+
+
+def main():
+    """Run from the repository root: python -m chatbot.utils.load_test --sessions 20"""
+    parser = argparse.ArgumentParser(description="Simulate concurrent chat sessions against fake LLM and embeddings.")
+    parser.add_argument("--sessions", type=int, default=20, help="Number of simulated students")
+    parser.add_argument("--concurrency", type=int, default=None, help="Sessions running at once (default: all)")
+    parser.add_argument("--fixtures", default=os.path.join(REPO_ROOT, "temp"), help="Folder of CV PDFs to upload")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds each fake LLM call sleeps")
+    parser.add_argument("--history-backend", choices=["sqlite", "redis"], default="sqlite")
+    parser.add_argument("--keep-workspace", action="store_true", help="Do not delete the scratch workspace")
+    parser.add_argument("--verbose", action="store_true", help="Show agent and tool output")
+    args = parser.parse_args()
+
+    fixtures = sorted(glob.glob(os.path.join(os.path.abspath(args.fixtures), "*.pdf")))
+    if not fixtures:
+        raise ValueError(f"No PDF fixtures found in {args.fixtures}.")
+    concurrency = args.concurrency or args.sessions
+
+    original_cwd = os.getcwd()
+    workspace = tempfile.mkdtemp(prefix="eopp-load-test-")
+    prepare_workspace(workspace, args.history_backend)
+    os.environ["FAKE_LLM_LATENCY"] = str(args.llm_latency)
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    try:
+        with contextlib.ExitStack() as output:
+            if not args.verbose:
+                output.enter_context(contextlib.redirect_stdout(output.enter_context(open(os.devnull, "w"))))
+            start = time.perf_counter()
+            seeded = seed_knowledge_base("chatbot/data/processed/updated_data.xlsx")
+            expected = compute_expected(fixtures)
+            warmup_time = time.perf_counter() - start
+
+            recorder = Recorder()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(
+                    lambda index: run_session(index, fixtures, expected, recorder), range(args.sessions)
+                ))
+            wall_time = time.perf_counter() - start
+
+        if args.keep_workspace:
+            print(f"Workspace (kept): {workspace}")
+        print(f"Warm-up: seeded {seeded} documents and computed reference answers in {warmup_time:.2f} s")
+        passed = print_report(results, recorder, wall_time, args.sessions, concurrency)
+    finally:
+        os.chdir(original_cwd)
+        if not args.keep_workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
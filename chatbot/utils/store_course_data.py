@@ -1,8 +1,12 @@
 import os
+import re
+import difflib
 import logging
+import pandas as pd
 from langchain_chroma import Chroma
 from dotenv import load_dotenv
 from langchain_community.document_loaders import TextLoader
+from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 
@@ -12,11 +16,217 @@ load_dotenv()
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Course catalog used to tag every chunk with its university, course and degree level
+catalog_file = "../data/processed/updated_data.xlsx"
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 100
+
+# Headings commonly found on course pages, matched at the start of a short line
+SECTION_KEYWORDS = (
+    "overview", "course overview", "about the course", "entry requirements", "english language requirements",
+    "international students", "fees", "tuition fees", "modules", "course structure", "course content",
+    "teaching and assessment", "assessment", "careers", "career opportunities", "how to apply", "key facts",
+)
+
+
+def slugify(text):
+    """Lowercase a course name, file name or URL segment and join its words with hyphens."""
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-")
+
+
+def load_course_lookup(file_path):
+    """
+    Index the catalog courses by their slugs (course name and last URL segment).
+
+    Returns:
+        dict: slug -> list of {"university", "course", "degree_level"} metadata dicts
+    """
+    df = pd.read_excel(file_path, sheet_name="Sheet1")
+    df = df[df["course_or_degree_name"].notna()]
+
+    lookup = {}
+    for _, row in df.iterrows():
+        metadata = {
+            "university": str(row["university_name"]).strip().lower(),
+            "course": str(row["course_or_degree_name"]).strip().lower(),
+            "degree_level": str(row["degree_program"]).strip().lower(),
+        }
+        url_segment = re.split(r"[?#]", str(row.get("course_url", "")))[0].rstrip("/").rsplit("/", 1)[-1]
+        for key in {slugify(row["course_or_degree_name"]), slugify(url_segment.removesuffix(".html"))}:
+            if key and metadata not in lookup.setdefault(key, []):
+                lookup[key].append(metadata)
+    return lookup
+
+
+def match_course_metadata(file_path, base_folder_path, lookup):
+    """
+    Find the catalog entry for a course document from its folder and file name.
+    When several entries match, only the fields they share are returned; an empty dict when none match.
+    """
+    universities = {metadata["university"] for candidates in lookup.values() for metadata in candidates}
+    relative_parts = os.path.relpath(file_path, base_folder_path).split(os.sep)
+
+    # A folder such as "westminster" or "University_of_Westminster" names the university
+    university = None
+    for folder in relative_parts[:-1]:
+        folder_slug = slugify(folder)
+        matches = [name for name in universities if folder_slug and folder_slug in slugify(name)]
+        if len(matches) == 1:
+            university = matches[0]
+            break
+
+    stem = slugify(os.path.splitext(relative_parts[-1])[0])
+    candidates = lookup.get(stem)
+    if not candidates:
+        close = difflib.get_close_matches(stem, list(lookup), n=1, cutoff=0.85)
+        candidates = lookup[close[0]] if close else []
+    if university:
+        candidates = [metadata for metadata in candidates if metadata["university"] == university]
+
+    if not candidates:
+        return {"university": university} if university else {}
+
+    # Several catalog entries share a slug (e.g. "psychology"): only tag the fields they all agree on
+    metadata = {key: value for key, value in candidates[0].items()
+                if all(candidate.get(key) == value for candidate in candidates)}
+    if "university" not in metadata:
+        # The same course name at different universities is not the same course
+        metadata.pop("course", None)
+    if len(candidates) > 1:
+        logging.warning(f"{file_path} matches {len(candidates)} catalog entries, tagging only {sorted(metadata)}")
+    return metadata
+
+
+def is_section_heading(line):
+    """Guess whether a line of a course page is a section heading."""
+    line = line.strip()
+    if not line or len(line) > 80:
+        return False
+    if line.startswith("#") or line.endswith(":"):
+        return True
+    return line.lower().startswith(SECTION_KEYWORDS) and len(line.split()) <= 6
+
+
+def heading_text(line):
+    """The heading name without its markdown "#" prefix or trailing colon."""
+    return line.strip().lstrip("#").strip().rstrip(":")
+
+
+def split_into_sections(text):
+    """
+    Split a course page into (heading, text) sections; text before the first heading has heading "".
+
+    No line is dropped: a heading directly followed by another heading is kept as text of the next
+    section, and headings left over at the end of the page are added to the last section.
+    """
+    sections = []
+    heading, carried, lines = "", [], []
+    for line in text.splitlines():
+        if is_section_heading(line):
+            if "".join(lines).strip():
+                sections.append((heading, "\n".join(carried + lines).strip()))
+                carried = []
+            elif heading:
+                carried.append(heading)
+            heading, lines = heading_text(line), []
+        else:
+            lines.append(line)
+
+    if "".join(lines).strip():
+        sections.append((heading, "\n".join(carried + lines).strip()))
+    else:
+        leftover = "\n".join(carried + [heading]).strip()
+        if leftover and sections:
+            last_heading, last_text = sections[-1]
+            sections[-1] = (last_heading, f"{last_text}\n{leftover}")
+        elif leftover:
+            sections.append(("", leftover))
+    return sections
+
+
+def find_missing_lines(text, chunks, chunk_size=CHUNK_SIZE):
+    """
+    Return the non-blank lines of a course page that do not appear in any of its chunks.
+    Lines longer than a chunk are split by the text splitter, so for those only their words are checked.
+    """
+    contents = [chunk.page_content for chunk in chunks]
+    all_words = set(" ".join(contents).split())
+    missing = []
+    for line in text.splitlines():
+        line = line.strip()
+        forms = {line, heading_text(line)} if is_section_heading(line) else {line}
+        if not heading_text(line):  # blank lines and bare "#" markers carry no text
+            continue
+        if len(line) > chunk_size:
+            covered = all(word in all_words for word in line.split())
+        else:
+            covered = any(form and form in content for form in forms for content in contents)
+        if not covered:
+            missing.append(line)
+    return missing
+
+
+def chunk_course_document(document, metadata, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP):
+    """
+    Chunk one course page along its sections.
+
+    Whole sections are packed together up to `chunk_size` characters, so a section is only split
+    when it is longer than a chunk on its own. Every chunk starts with a line naming the course
+    and carries the course metadata plus the headings it contains.
+    """
+    header = " | ".join(
+        f"{label}: {metadata[key]}"
+        for label, key in [("University", "university"), ("Course", "course"), ("Level", "degree_level")]
+        if key in metadata
+    )
+    oversized_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    base_metadata = {**document.metadata, **metadata}
+
+    chunks = []
+    pending_headings, pending_texts = [], []
+
+    def flush():
+        if pending_texts:
+            content = "\n\n".join(pending_texts)
+            chunks.append(Document(
+                page_content=f"{header}\n\n{content}" if header else content,
+                metadata={**base_metadata, "section": "; ".join(h for h in pending_headings if h)},
+            ))
+            pending_headings.clear()
+            pending_texts.clear()
+
+    for heading, text in split_into_sections(document.page_content):
+        section = f"{heading}\n{text}" if heading else text
+        if len(section) > chunk_size:
+            flush()
+            for piece in oversized_splitter.split_text(text):
+                pending_headings.append(heading)
+                pending_texts.append(f"{heading}\n{piece}" if heading else piece)
+                flush()
+            continue
+        if sum(len(t) for t in pending_texts) + len(section) > chunk_size:
+            flush()
+        pending_headings.append(heading)
+        pending_texts.append(section)
+    flush()
+
+    missing = find_missing_lines(document.page_content, chunks, chunk_size)
+    if missing:
+        logging.error(f"{len(missing)} lines of {document.metadata.get('source', 'a course page')} "
+                      f"are missing from its chunks, e.g. {missing[0]!r}")
+
+    return chunks
+
 
 def create_chroma_vectorstore_from_folders(base_folder_path, collection_name="document_collection"):
     """
     Create a Chroma vector store from text files in specified folder and its subfolders.
 
+    Each file is treated as one course page: it is matched to the course catalog, chunked along its
+    sections, and every chunk is tagged with the university, course and degree level so that
+    retrieval can be filtered on them.
+
     Args:
         base_folder_path (str): Path to the base folder containing subfolders with text files
         collection_name (str, optional): Name of the Chroma collection. Defaults to "document_collection"
@@ -31,7 +241,9 @@ def create_chroma_vectorstore_from_folders(base_folder_path, collection_name="do
         raise ValueError(f"Folder path {base_folder_path} does not exist.")
 
     embeddings = OpenAIEmbeddings()
-    documents = []
+    course_lookup = load_course_lookup(catalog_file)
+    splits = []
+    unmatched = 0
 
     # Walk through all subdirectories and files
     for subdir, _, files in os.walk(base_folder_path):
@@ -42,20 +254,20 @@ def create_chroma_vectorstore_from_folders(base_folder_path, collection_name="do
                 try:
                     logging.info(f"Loading file: {file_path}")
                     loader = TextLoader(file_path, encoding='utf-8')
-                    documents.extend(loader.load())
+                    metadata = match_course_metadata(file_path, base_folder_path, course_lookup)
+                    if "course" not in metadata:
+                        unmatched += 1
+                        logging.warning(f"No unique catalog course found for {file_path}")
+                    for document in loader.load():
+                        splits.extend(chunk_course_document(document, metadata))
                 except Exception as e:
                     logging.error(f"Error loading {filename}: {e}")
 
-    if not documents:
+    if not splits:
         logging.warning("No text documents found in the specified folder.")
         raise ValueError("No text documents found in the specified folder.")
 
-    logging.info("Splitting documents into chunks...")
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=100
-    )
-    splits = text_splitter.split_documents(documents)
+    logging.info(f"Created {len(splits)} chunks ({unmatched} files without a unique catalog match).")
 
     logging.info("Creating Chroma vector store...")
     vectorstore = Chroma.from_documents(
@@ -0,0 +1,179 @@
+import json
+import os
+import time
+from functools import lru_cache
+
+# Rows fetched from Chroma per request while exporting
+EXPORT_BATCH_SIZE = 1000
+# Rows of an int8 index converted to float32 at a time while searching
+SEARCH_BLOCK_SIZE = 4096
+
+
+def sidecar_path(index_dir, name):
+    """Return the path of the JSON sidecar that describes an exported index."""
+    return os.path.join(index_dir, f"{name}.json")
+
+
+def export_collection(chroma_db, index_dir, name="spec", quantize=False):
+    """
+    Dump a Chroma collection into a memory-mappable matrix plus a JSON sidecar.
+
+    Vectors are L2-normalized so a dot product gives the cosine similarity. With `quantize`,
+    each row is stored as int8 with one float32 scale per row (4x smaller file).
+
+    Each export writes its matrix under a new file name and then atomically replaces the sidecar,
+    which points at the matrix. Processes that already mapped the previous export keep reading
+    the previous files, so they never see a half-written or mismatched index.
+
+    Args:
+        chroma_db (Chroma): Vector store to export
+        index_dir (str): Output folder
+        name (str, optional): File name prefix. Defaults to "spec"
+        quantize (bool, optional): Store int8 instead of float32. Defaults to False
+
+    Returns:
+        int: Number of exported vectors
+    """
+    import numpy as np
+
+    count = chroma_db._collection.count()
+    if count == 0:
+        raise ValueError("The collection is empty, nothing to export.")
+
+    os.makedirs(index_dir, exist_ok=True)
+    generation = f"{name}.{time.time_ns()}"
+    vectors_file, scales_file = f"{generation}.vectors", f"{generation}.scales"
+    vectors_tmp = os.path.join(index_dir, f"{vectors_file}.tmp")
+
+    vectors = None
+    scales = np.zeros(count, dtype=np.float32)
+    ids, documents, metadatas = [], [], []
+
+    for offset in range(0, count, EXPORT_BATCH_SIZE):
+        batch = chroma_db.get(limit=EXPORT_BATCH_SIZE, offset=offset,
+                              include=["embeddings", "documents", "metadatas"])
+        embeddings = np.asarray(batch["embeddings"], dtype=np.float32)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+        if vectors is None:
+            vectors = np.memmap(vectors_tmp, dtype=np.int8 if quantize else np.float32, mode="w+",
+                                shape=(count, embeddings.shape[1]))
+
+        rows = slice(offset, offset + len(embeddings))
+        if quantize:
+            scales[rows] = np.abs(embeddings).max(axis=1) / 127
+            vectors[rows] = np.round(embeddings / np.maximum(scales[rows, None], 1e-12)).astype(np.int8)
+        else:
+            vectors[rows] = embeddings
+
+        ids.extend(batch["ids"])
+        documents.extend(batch["documents"])
+        metadatas.extend(batch["metadatas"])
+
+    dim = vectors.shape[1]
+    vectors.flush()
+    del vectors
+    os.replace(vectors_tmp, os.path.join(index_dir, vectors_file))
+    if quantize:
+        scales.tofile(os.path.join(index_dir, f"{scales_file}.tmp"))
+        os.replace(os.path.join(index_dir, f"{scales_file}.tmp"), os.path.join(index_dir, scales_file))
+
+    # The sidecar goes last: until it is replaced, readers still load the previous export
+    sidecar_tmp = f"{sidecar_path(index_dir, name)}.tmp"
+    with open(sidecar_tmp, "w", encoding="utf-8") as file:
+        json.dump({
+            "dtype": "int8" if quantize else "float32",
+            "count": count,
+            "dim": dim,
+            "vectors_file": vectors_file,
+            "scales_file": scales_file if quantize else None,
+            "ids": ids,
+            "documents": documents,
+            "metadatas": metadatas,
+        }, file)
+    os.replace(sidecar_tmp, sidecar_path(index_dir, name))
+
+    # Remove older exports; processes still mapping them keep their pages until they exit
+    for filename in os.listdir(index_dir):
+        if filename.startswith(f"{name}.") and filename.endswith((".vectors", ".scales")) \
+                and not filename.startswith(generation):
+            os.remove(os.path.join(index_dir, filename))
+
+    return count
+
+
+class MmapVectorIndex:
+    """Brute-force cosine search over an index written by `export_collection`."""
+
+    def __init__(self, index_dir, name="spec"):
+        import numpy as np
+
+        with open(sidecar_path(index_dir, name), "r", encoding="utf-8") as file:
+            sidecar = json.load(file)
+
+        self.ids = sidecar["ids"]
+        self.documents = sidecar["documents"]
+        self.metadatas = sidecar["metadatas"]
+        self.dim = sidecar["dim"]
+
+        # Read-only mappings are backed by the page cache, so every worker process shares them
+        self.vectors = np.memmap(os.path.join(index_dir, sidecar["vectors_file"]), dtype=sidecar["dtype"],
+                                 mode="r", shape=(sidecar["count"], self.dim))
+        self.scales = None
+        if sidecar["scales_file"]:
+            self.scales = np.memmap(os.path.join(index_dir, sidecar["scales_file"]), dtype=np.float32, mode="r")
+
+    def __len__(self):
+        return len(self.ids)
+
+    @lru_cache(maxsize=16)
+    def metadata_column(self, key):
+        """One metadata field for every row as an array, built once per field and reused for filtering."""
+        import numpy as np
+
+        return np.array([(metadata or {}).get(key) for metadata in self.metadatas], dtype=object)
+
+    def search(self, query_embedding, k=4, where=None):
+        """
+        Return the k most similar entries as (score, document, metadata) tuples, best first.
+        `where` restricts the search to rows whose metadata equals every given value, e.g. {"university": "..."}.
+        """
+        import numpy as np
+
+        query = np.array(query_embedding, dtype=np.float32)
+        if query.shape != (self.dim,):
+            raise ValueError(f"Query has dimension {query.shape}, index expects {self.dim}.")
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+
+        rows = np.arange(len(self.ids))
+        if where:
+            mask = np.ones(len(rows), dtype=bool)
+            for key, value in where.items():
+                mask &= self.metadata_column(key) == value
+            rows = rows[mask]
+
+        vectors = self.vectors[rows] if where else self.vectors
+        if self.scales is None:
+            scores = vectors @ query
+        else:
+            # Upcast int8 rows block by block so a query never materializes the whole matrix as float32
+            scores = np.concatenate([
+                vectors[start:start + SEARCH_BLOCK_SIZE].astype(np.float32) @ query
+                for start in range(0, len(vectors), SEARCH_BLOCK_SIZE)
+            ] or [np.zeros(0, dtype=np.float32)])
+            scores *= self.scales[rows]
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.documents[rows[i]], self.metadatas[rows[i]]) for i in top]
+
+
+@lru_cache(maxsize=4)
+def load_vector_index(index_dir, name="spec"):
+    """Map an exported index once per process, or return None when it has not been exported."""
+    if not os.path.exists(sidecar_path(index_dir, name)):
+        return None
+    return MmapVectorIndex(index_dir, name)
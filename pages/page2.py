@@ -1,12 +1,20 @@
 import os
+import uuid
 import streamlit as st
-from langchain_community.callbacks import StreamlitCallbackHandler
 from chatbot.agent import setup_agent
 from chatbot.analyze_cv import extract_cv_details
-from chatbot.memory import memory_storage
+from chatbot.memory import get_message_history
 
 st.header("Chat")
 
+# Messages shown per page of the conversation; older pages are loaded on request
+HISTORY_PAGE_SIZE = 20
+
+# Keep the session id in the URL so the conversation survives restarts and replica switches
+if "session" not in st.query_params:
+    st.query_params["session"] = uuid.uuid4().hex
+session_id = st.query_params["session"]
+
 uploaded_file = st.file_uploader("Upload a PDF file", type="pdf")
 
 if uploaded_file is not None:
@@ -27,8 +35,18 @@ if getattr(st.session_state, 'pdf_uploaded', False):
     with st.expander("expand"):
         st.write(st.session_state.cv_details)
 
-    for i, msg in enumerate(memory_storage.messages):
-        name = "user" if i % 2 == 0 else "assistant"
+    # Only read the most recent pages of the conversation on each rerun
+    history = get_message_history(session_id)
+    pages_shown = st.session_state.get("history_pages", 1)
+    total = history.count()
+    offset = max(total - pages_shown * HISTORY_PAGE_SIZE, 0)
+
+    if offset > 0 and st.button("Show earlier messages"):
+        st.session_state.history_pages = pages_shown + 1
+        st.rerun()
+
+    for msg in history.get_messages(offset=offset, limit=total - offset):
+        name = "user" if msg.type == "human" else "assistant"
         st.chat_message(name).markdown(msg.content)
 
     # Hardcoded welcome message from the assistant after CV submission
@@ -38,13 +56,15 @@ if getattr(st.session_state, 'pdf_uploaded', False):
         st.session_state.welcome_message_sent = True
 
     if user_input := st.chat_input("User Input"):
+        from langchain_community.callbacks import StreamlitCallbackHandler
+
         with st.chat_message("user"):
             st.markdown(user_input)
 
         with st.spinner("Generating Response..."):
             with st.chat_message("assistant"):
                 st_callback = StreamlitCallbackHandler(st.container())
-                agent_executor = setup_agent()
+                agent_executor = setup_agent(session_id)
                 response = agent_executor.invoke(
                     {"input": user_input}, callbacks=[st_callback]
                 )
@@ -53,4 +73,4 @@ if getattr(st.session_state, 'pdf_uploaded', False):
                 st.markdown(answer)
 
     if st.sidebar.button("Clear Chat History"):
-        memory_storage.clear()
+        get_message_history(session_id).clear()